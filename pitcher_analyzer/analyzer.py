@@ -399,12 +399,13 @@ def list_buckets(project_id):
 #     "pitcher_videos/video.mp4"
 # )
 
-# Your project ID
-project_id = "baseball-pitcher-analyzer"
-
-# First, let's see what buckets you already have
-list_buckets(project_id)
-
-# Let's create a bucket if needed (bucket names must be globally unique)
-bucket_name = "baseball-pitcher-analyzer-videos"
-bucket = check_and_create_bucket(project_id, bucket_name)
+if __name__ == "__main__":
+    # Your project ID
+    project_id = "baseball-pitcher-analyzer"
+    
+    # First, let's see what buckets you already have
+    list_buckets(project_id)
+    
+    # Let's create a bucket if needed (bucket names must be globally unique)
+    bucket_name = "baseball-pitcher-analyzer-videos"
+    bucket = check_and_create_bucket(project_id, bucket_name)
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from google.api_core.exceptions import NotFound
+from verify_environment import EnvironmentVerifier
+
+class _Future:
+    """Stand-in for the future a batched request leaves behind when it fails"""
+    def get(self, key, default=None):
+        raise KeyError(f"Cannot get({key!r}, default={default!r}) on a future")
+
+class TestCheckGcsSetup(unittest.TestCase):
+    def setUp(self):
+        self.existing = {'existing-bucket'}
+        self.client = MagicMock()
+        self.client.bucket.side_effect = self._make_bucket
+        
+        # The batch raises NotFound on exit if any deferred reload 404'd
+        self.reloaded = []
+        batch = self.client.batch.return_value
+        batch.__exit__.side_effect = self._finish_batch
+        
+        patcher = patch.multiple(EnvironmentVerifier, _client=self.client, _bucket_exists_cache={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.verifier = EnvironmentVerifier()
+        
+    def _make_bucket(self, name):
+        bucket = MagicMock()
+        bucket.name = name
+        bucket._properties = {}
+        bucket.reload.side_effect = lambda: self.reloaded.append(bucket)
+        return bucket
+        
+    def _finish_batch(self, *exc_info):
+        missing = False
+        for bucket in self.reloaded:
+            if bucket.name in self.existing:
+                bucket._properties = {'name': bucket.name, 'id': bucket.name}
+            else:
+                bucket._properties = _Future()
+                missing = True
+        if missing:
+            raise NotFound("bucket not found")
+        return False
+        
+    def test_existing_bucket(self):
+        """Test an existing bucket passes and is cached"""
+        self.assertTrue(self.verifier.check_gcs_setup(['existing-bucket']))
+        self.assertEqual(EnvironmentVerifier._bucket_exists_cache, {'existing-bucket': True})
+        
+    def test_missing_bucket(self):
+        """Test a 404 inside the batch reports the bucket as missing"""
+        with self.assertLogs('verify_environment', level='WARNING') as logs:
+            self.assertFalse(self.verifier.check_gcs_setup(['existing-bucket', 'missing-bucket']))
+        self.assertIn("Storage buckets do not exist: ['missing-bucket']", logs.output[0])
+        self.assertEqual(EnvironmentVerifier._bucket_exists_cache,
+                         {'existing-bucket': True, 'missing-bucket': False})
+        
+    def test_cached_buckets_skip_lookup(self):
+        """Test cached results don't issue another batch"""
+        self.verifier.check_gcs_setup(['existing-bucket'])
+        self.verifier.check_gcs_setup(['existing-bucket'])
+        self.assertEqual(self.client.batch.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import Mock, patch
+import cv2
+import numpy as np
+from pitcher_analyzer.video_processor import VideoProcessor
+
+class TestExtractFramesFfmpeg(unittest.TestCase):
+    def setUp(self):
+        self.processor = VideoProcessor()
+        # Distinct solid frames so each JPEG decodes to a known value
+        self.jpegs = [
+            cv2.imencode('.jpg', np.full((48, 64, 3), value, dtype=np.uint8))[1].tobytes()
+            for value in (20, 120, 220)
+        ]
+
+    def _extract(self, frame_indices, stdout):
+        result = Mock(returncode=0, stdout=stdout, stderr=b'')
+        with patch('pitcher_analyzer.video_processor.shutil.which', return_value='ffmpeg'), \
+             patch('pitcher_analyzer.video_processor.subprocess.run', return_value=result):
+            return self.processor._extract_frames_ffmpeg('clip.mp4', frame_indices)
+
+    def test_splits_back_to_back_jpegs(self):
+        """Test piped JPEGs are split on EOI/SOI into the original images"""
+        frames = self._extract([5, 10, 15], b''.join(self.jpegs))
+        self.assertEqual(frames, self.jpegs)
+        for frame, value in zip(frames, (20, 120, 220)):
+            decoded = cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR)
+            self.assertLessEqual(np.abs(decoded.astype(int) - value).max(), 2)
+
+    def test_unsorted_and_repeated_indices(self):
+        """Test frames come back in request order, repeating duplicates"""
+        # ffmpeg emits each selected frame once, in stream order
+        frames = self._extract([15, 5, 15, 10], b''.join(self.jpegs))
+        self.assertEqual(frames, [self.jpegs[2], self.jpegs[0], self.jpegs[2], self.jpegs[1]])
+
+    def test_frame_count_mismatch(self):
+        """Test a short ffmpeg output is rejected so the OpenCV path is used"""
+        self.assertIsNone(self._extract([5, 10, 15], b''.join(self.jpegs[:2])))
+
+    def test_ffmpeg_missing(self):
+        """Test extraction is skipped without ffmpeg"""
+        with patch('pitcher_analyzer.video_processor.shutil.which', return_value=None):
+            self.assertIsNone(self.processor._extract_frames_ffmpeg('clip.mp4', [5]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import cv2
+import numpy as np
+from pitcher_analyzer.visualization import (
+    _BAL_COLORS, _parse_analysis_text, _visualize_balance, _wrap_text, apply_overlay,
+    create_analysis_visualization, create_scorecard, prepare_overlay, render_overlay
+)
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+class TestParseAnalysisText(unittest.TestCase):
+    def test_categories_and_assessment(self):
+        """Test bullets are assigned to the category above them"""
+        text = (
+            "Signs of Fatigue:\n"
+            "- Release point dropping\n"
+            "Arm:\n"
+            "  - Slot is consistent  \n"
+            "Balance:\n"
+            "- Falling toward first base\n"
+            "Mechanics Assessment: 12%\n"
+        )
+        self.assertEqual(_parse_analysis_text(text), {
+            'fatigue': 'Release point dropping',
+            'arm': 'Slot is consistent',
+            'balance': 'Falling toward first base',
+            'assessment': '12%'
+        })
+
+    def test_crlf_lines(self):
+        """Test Windows line endings are stripped from parsed values"""
+        text = "Arm:\r\n- Late\r\nMechanics Assessment: 8%\r\n"
+        result = _parse_analysis_text(text)
+        self.assertEqual(result['arm'], 'Late')
+        self.assertEqual(result['assessment'], '8%')
+
+    def test_category_and_bullet_on_one_line(self):
+        """Test a line naming a category switches category rather than counting as a bullet"""
+        text = "Signs of Fatigue:\n- Arm: dragging\n- Elbow low"
+        result = _parse_analysis_text(text)
+        self.assertEqual(result['fatigue'], '')
+        self.assertEqual(result['arm'], 'Elbow low')
+
+    def test_category_priority(self):
+        """Test fatigue outranks arm, which outranks balance, on the same line"""
+        result = _parse_analysis_text("Balance: Arm:\n- first\nBalance: Signs of Fatigue:\n- second")
+        self.assertEqual(result['arm'], 'first')
+        self.assertEqual(result['fatigue'], 'second')
+        self.assertEqual(result['balance'], '')
+
+    def test_repeated_assessment(self):
+        """Test the assessment stops at a repeated label and the last line wins"""
+        text = (
+            "Mechanics Assessment: 10% Mechanics Assessment: 20%\n"
+            "Mechanics Assessment: 15% Mechanics Assessment: 25%"
+        )
+        self.assertEqual(_parse_analysis_text(text)['assessment'], '15%')
+
+    def test_bullet_before_any_category(self):
+        """Test bullets with no category above them are ignored"""
+        result = _parse_analysis_text("- orphan\n\n   \nArm:")
+        self.assertEqual(result, {'fatigue': '', 'arm': '', 'balance': '', 'assessment': 'N/A'})
+
+    def test_invalid_text(self):
+        """Test non-text input falls back to the defaults"""
+        self.assertEqual(_parse_analysis_text(None)['assessment'], 'N/A')
+
+class TestCreateScorecard(unittest.TestCase):
+    def _drawn_texts(self, analysis_text):
+        with patch('pitcher_analyzer.visualization.cv2.putText') as put_text:
+            create_scorecard(analysis_text)
+        return [call.args[1] for call in put_text.call_args_list]
+
+    def test_categories_case_insensitive(self):
+        """Test categories match regardless of case and across CRLF lines"""
+        texts = self._drawn_texts("arm\r\n- Low slot\r\nBALANCE notes\r\n- Drifting\r\n")
+        self.assertIn("- Low slot", texts)
+        self.assertIn("- Drifting", texts)
+
+    def test_bullet_naming_a_category(self):
+        """Test a bullet mentioning a category is filed under that category"""
+        texts = self._drawn_texts("Signs of fatigue:\n- arm angle dropping")
+        self.assertEqual(texts.count("- arm angle dropping"), 1)
+        self.assertEqual(texts[texts.index("ARM") + 1], "- arm angle dropping")
+
+    def test_first_assessment_wins(self):
+        """Test the first assessment, up to a repeated label, is shown"""
+        texts = self._drawn_texts(
+            "Mechanics Assessment: 5% Mechanics Assessment: 9%\n"
+            "Mechanics Assessment: 7%"
+        )
+        self.assertIn("Deviation from ideal: 5%", texts)
+
+    def test_missing_assessment(self):
+        """Test a missing assessment is shown as N/A"""
+        self.assertIn("Deviation from ideal: N/A", self._drawn_texts("Arm:\n- Fine"))
+
+class TestWrapText(unittest.TestCase):
+    def _width(self, text, scale):
+        return cv2.getTextSize(text, FONT, scale, 1)[0][0]
+
+    def test_empty_text(self):
+        """Test empty text wraps to no lines"""
+        self.assertEqual(_wrap_text("", 100, FONT, 0.5), [])
+
+    def test_first_word_too_wide(self):
+        """Test an over-wide first word is preceded by an empty line"""
+        self.assertEqual(_wrap_text("extraordinarily short", 20, FONT, 0.5),
+                         ['', 'extraordinarily', 'short'])
+
+    def test_lines_are_greedy_and_fit(self):
+        """Test every line fits and the next word would not have"""
+        text = ("Hand breaks late and the arm drags behind the front shoulder "
+                "through release, which costs velocity and command")
+        for scale in (0.4, 0.5, 0.7):
+            for max_width in (60, 120, 250, 400):
+                lines = _wrap_text(text, max_width, FONT, scale)
+                self.assertEqual(' '.join(lines).split(), text.split())
+                for i, line in enumerate(lines):
+                    if ' ' in line:
+                        self.assertLessEqual(self._width(line, scale), max_width)
+                    if i + 1 < len(lines):
+                        next_word = lines[i + 1].split()[0]
+                        self.assertGreater(self._width(f"{line} {next_word}", scale), max_width)
+
+class TestOverlay(unittest.TestCase):
+    def _draw(self, overlay):
+        cv2.rectangle(overlay, (10, 20), (109, 59), (40, 30, 20), -1)
+        cv2.putText(overlay, "Arm slot 12%", (15, 45), FONT, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+        # Text running past the card gives partially covered edge pixels
+        cv2.putText(overlay, "overflow", (90, 80), FONT, 0.6, (0, 200, 255), 1, cv2.LINE_AA)
+
+    def test_render_overlay_crops_to_drawing(self):
+        """Test the overlay is cropped to the drawn area with exact opaque colors"""
+        def draw(overlay):
+            cv2.rectangle(overlay, (10, 20), (49, 39), (10, 200, 30), -1)
+        colors, alpha, offset = render_overlay(draw, 160, 90)
+        self.assertEqual(offset, (10, 20))
+        self.assertEqual(colors.shape, (20, 40, 3))
+        self.assertTrue(np.all(alpha == 1))
+        self.assertTrue(np.all(colors == (10, 200, 30)))
+
+    def test_apply_overlay_matches_blend(self):
+        """Test compositing matches a full per-pixel alpha blend"""
+        colors, alpha, _ = render_overlay(self._draw, 160, 90)
+        overlay = prepare_overlay(colors, alpha)
+        self.assertGreater(len(overlay[3]), 0)
+
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            roi = rng.integers(0, 256, colors.shape, dtype=np.uint8)
+            expected = cv2.blendLinear(colors, roi, alpha, 1 - alpha)
+            apply_overlay(roi, overlay)
+            self.assertLessEqual(np.abs(roi.astype(int) - expected).max(), 1)
+
+    def test_apply_overlay_leaves_uncovered_pixels(self):
+        """Test pixels the overlay doesn't cover are untouched"""
+        colors, alpha, _ = render_overlay(self._draw, 160, 90)
+        roi = np.full(colors.shape, 77, dtype=np.uint8)
+        apply_overlay(roi, prepare_overlay(colors, alpha))
+        self.assertTrue(np.all(roi[alpha == 0] == 77))
+        self.assertTrue(np.array_equal(roi[alpha == 1], colors[alpha == 1]))
+
+class TestCreateAnalysisVisualization(unittest.TestCase):
+    FRAMES = 40
+    
+    def _frame(self, index):
+        # Frame index as a row of black/white blocks in the top right corner,
+        # clear of the scorecard
+        frame = np.full((120, 160, 3), 60, dtype=np.uint8)
+        for bit in range(6):
+            if index >> bit & 1:
+                frame[0:16, 144 - 16 * bit:160 - 16 * bit] = 250
+        return frame
+    
+    def _frame_indices(self, video_path):
+        cap = cv2.VideoCapture(video_path)
+        indices = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            indices.append(sum(1 << bit for bit in range(6)
+                               if frame[4:12, 148 - 16 * bit:156 - 16 * bit].mean() > 150))
+        cap.release()
+        return indices
+    
+    def _assert_parallel_matches_serial(self, video_path, tmp_dir):
+        serial_path = os.path.join(tmp_dir, "serial.mp4")
+        create_analysis_visualization(video_path, "Arm:\n- Late", "slider",
+                                      output_path=serial_path)
+        
+        # Three or more segments, rendered on threads so the test needs no spawned interpreters
+        parallel_path = os.path.join(tmp_dir, "parallel.mp4")
+        with patch('pitcher_analyzer.visualization.MIN_SEGMENT_FRAMES', 10), \
+             patch('pitcher_analyzer.visualization.os.cpu_count', return_value=3), \
+             patch('pitcher_analyzer.visualization.ProcessPoolExecutor',
+                   lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)), \
+             self.assertNoLogs('pitcher_analyzer.visualization'):
+            create_analysis_visualization(video_path, "Arm:\n- Late", "slider",
+                                          output_path=parallel_path)
+        
+        serial = self._frame_indices(serial_path)
+        self.assertEqual(serial, list(range(self.FRAMES)))
+        self.assertEqual(self._frame_indices(parallel_path), serial)
+    
+    def test_parallel_matches_serial(self):
+        """Test segmented rendering writes every frame once, in order, like the serial path"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            video_path = os.path.join(tmp_dir, "clip.avi")
+            out = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (160, 120))
+            for i in range(self.FRAMES):
+                out.write(self._frame(i))
+            out.release()
+            self._assert_parallel_matches_serial(video_path, tmp_dir)
+    
+    @unittest.skipIf(shutil.which('ffmpeg') is None, "needs ffmpeg to write a variable frame rate clip")
+    def test_parallel_matches_serial_vfr(self):
+        """Test segment boundaries stay frame exact on variable frame rate input"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            video_path = os.path.join(tmp_dir, "clip.mkv")
+            # Every third frame is held longer, so time and frame number drift apart
+            cmd = [
+                'ffmpeg', '-y', '-v', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', '160x120', '-r', '30', '-i', '-',
+                '-vf', "setpts='(N+floor(N/3)*0.7)/30/TB'", '-fps_mode', 'passthrough',
+                '-c:v', 'mjpeg', video_path
+            ]
+            frames = b''.join(self._frame(i).tobytes() for i in range(self.FRAMES))
+            subprocess.run(cmd, input=frames, check=True)
+            self._assert_parallel_matches_serial(video_path, tmp_dir)
+    
+    def test_unreadable_video(self):
+        """Test a video that can't be opened raises ValueError naming the path"""
+        with self.assertRaisesRegex(ValueError, "missing_clip.mp4"):
+            create_analysis_visualization("missing_clip.mp4", "Arm:\n- Late", "slider",
+                                          output_path="unused.mp4")
+
+class TestVisualizeBalance(unittest.TestCase):
+    def _head_color(self, deviation):
+        helper = Mock()
+        helper._get_hips_center.return_value = SimpleNamespace(x=80, y=100)
+        landmarks = {'nose': SimpleNamespace(x=60, y=20)}
+        overlay = np.zeros((120, 160, 3), dtype=np.uint8)
+        # The center line isn't under test (cv2 has no dashed line type)
+        with patch('pitcher_analyzer.visualization.cv2.line'), \
+             patch('pitcher_analyzer.visualization.cv2.LINE_DASHED', cv2.LINE_8, create=True):
+            _visualize_balance(helper, overlay, landmarks, deviation)
+        return tuple(int(c) for c in overlay[20, 60])
+
+    def test_numpy_scalar_deviation(self):
+        """Test numpy float deviations pick the head marker color like Python floats"""
+        for dtype in (np.float32, np.float64):
+            self.assertEqual(self._head_color(dtype(0.05)), _BAL_COLORS[0])
+            self.assertEqual(self._head_color(dtype(0.25)), _BAL_COLORS[1])
+        self.assertEqual(self._head_color(0.25), _BAL_COLORS[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,21 @@
 import logging
 from pathlib import Path
 import json
+import subprocess
+import tempfile
 from ..video_manager import VideoManager
 from ..analyzer import PitcherAnalyzer
 import cv2
 import numpy as np
 from ..config import Config
+from ..visualization import (
+    _ffmpeg_h264_encoder, apply_overlay, open_video_writer, prepare_overlay, render_overlay
+)
 from datetime import datetime  # Add at the top
 
+# Score colors (BGR) indexed by get_score_colors: red, orange, green
+_COLOR_LUT = np.array([(0, 0, 255), (255, 165, 0), (0, 255, 0)], dtype=np.int32)
+
 class DebugUtility:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -79,6 +87,15 @@ def determine_pitch_type(velocity, pitcher_name='KERSHAW'):
             
     return None  # Unknown pitch type
 
+def get_score_colors(scores, deviations):
+    """Get colors for arrays of scores and deviations from ideal"""
+    scores = np.asarray(scores)
+    deviations = np.asarray(deviations)
+    good = (scores >= 8) & (deviations < 10)  # Close to ideal
+    ok = (scores >= 6) & (deviations < 20)    # Acceptable
+    idx = np.where(good, 2, np.where(ok, 1, 0))
+    return _COLOR_LUT[idx]
+
 def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher_name='KERSHAW', output_path=None):
     """Create visualization with mechanical analysis overlay"""
     if output_path is None:
@@ -90,9 +107,9 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
     fps = cap.get(cv2.CAP_PROP_FPS)
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    if not cap.isOpened() or width <= 0 or height <= 0:
+        cap.release()
+        raise ValueError(f"Could not open video file {video_path}")
     
     # Overlay dimensions
     overlay_width = int(width * 0.25)
@@ -132,24 +149,21 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
                 
         return result
 
-    def get_score_color(score, deviation):
-        """Get color based on score and deviation from ideal"""
-        if score >= 8 and deviation < 10:  # Close to ideal
-            return (0, 255, 0)  # Green
-        elif score >= 6 and deviation < 20:  # Acceptable
-            return (255, 165, 0)  # Orange
-        else:
-            return (0, 0, 255)  # Red
-
     analysis = parse_analysis_text(analysis_text)
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-            
-        overlay = frame.copy()
-        
+
+    # Category scores and their colors
+    categories = [
+        ("POWER", analysis['power']['score'], analysis['power']['deviation']),
+        ("ARM", analysis['arm']['score'], analysis['arm']['deviation']),
+        ("BALANCE", analysis['balance']['score'], analysis['balance']['deviation'])
+    ]
+    category_colors = get_score_colors(
+        [value for _, value, _ in categories],
+        [deviation for _, _, deviation in categories]
+    ).tolist()
+
+    def draw_scorecard(overlay):
+        """Draw the scorecard onto an image"""
         # Background
         cv2.rectangle(overlay, 
                      (overlay_x, overlay_y), 
@@ -186,18 +200,11 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
 
         # Categories with deviation indicators
         y += line_spacing
-        categories = [
-            ("POWER", analysis['power']['score'], analysis['power']['deviation']),
-            ("ARM", analysis['arm']['score'], analysis['arm']['deviation']),
-            ("BALANCE", analysis['balance']['score'], analysis['balance']['deviation'])
-        ]
-        
-        for cat, value, deviation in categories:
-            color = get_score_color(value, deviation)
+        for (cat, value, deviation), color in zip(categories, category_colors):
             display_text = f"{cat}: {value}/10 ({deviation:+.1f}°)"
             cv2.putText(overlay, display_text,
                       (content_x, int(y)),
-                      cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE, color, 1)
+                      cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE, tuple(color), 1)
             y += line_spacing
 
         # Add total deviation
@@ -206,10 +213,60 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
                   (content_x, int(y + line_spacing)),
                   cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE * 0.8, WHITE, 1)
 
-        # Blend overlay
-        frame = cv2.addWeighted(overlay, 0.95, frame, 0.05, 0)
+    # The scorecard is the same on every frame, so draw it once
+    scorecard, alpha, (x0, y0) = render_overlay(draw_scorecard, width, height)
+
+    # Composite the pre-rendered scorecard with ffmpeg instead of re-encoding in Python
+    if _overlay_with_ffmpeg(video_path, output_path, scorecard, alpha, x0, y0):
+        cap.release()
+        return output_path
+
+    out = open_video_writer(output_path, fps, (width, height))
+    y1, x1 = y0 + scorecard.shape[0], x0 + scorecard.shape[1]
+    overlay = prepare_overlay(scorecard, alpha)
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        # Only the scorecard region is touched
+        apply_overlay(frame[y0:y1, x0:x1], overlay)
         out.write(frame)
     
     cap.release()
     out.release()
-    return output_path 
\ No newline at end of file
+    return output_path
+
+def _overlay_with_ffmpeg(video_path, output_path, scorecard, alpha, x0, y0):
+    """Save the pre-rendered scorecard as a PNG and let ffmpeg composite it onto the video"""
+    encoder = _ffmpeg_h264_encoder()
+    if encoder is None:
+        return False
+
+    # Opaque where drawn, matching the frame loop
+    alpha = np.rint(255 * alpha).astype(np.uint8)
+    scorecard = np.dstack([scorecard, alpha])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scorecard_path = str(Path(tmp_dir) / "scorecard.png")
+        if not cv2.imwrite(scorecard_path, scorecard):
+            return False
+
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', str(video_path),
+            '-i', scorecard_path,
+            '-filter_complex', f'[0:v][1:v]overlay={x0}:{y0}',
+            '-c:v', encoder, '-preset', 'p4' if encoder == 'h264_nvenc' else 'veryfast',
+            '-pix_fmt', 'yuv420p',
+            '-an',
+            str(output_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+
+    if result.returncode != 0:
+        logging.getLogger(__name__).warning(
+            f"ffmpeg overlay failed, falling back to frame loop: {result.stderr.decode(errors='ignore')[-200:]}")
+        return False
+    return True
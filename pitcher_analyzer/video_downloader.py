@@ -22,6 +22,7 @@ class MLBVideoDownloader:
     
     def validate_video(self, video_path):
         """Validate downloaded video meets requirements"""
+        cap = None
         try:
             cap = cv2.VideoCapture(str(video_path))
             
@@ -30,10 +31,13 @@ class MLBVideoDownloader:
                 return False, "Could not open video file"
             
             # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps, frame_count, width, height = (cap.get(prop) for prop in (
+                cv2.CAP_PROP_FPS,
+                cv2.CAP_PROP_FRAME_COUNT,
+                cv2.CAP_PROP_FRAME_WIDTH,
+                cv2.CAP_PROP_FRAME_HEIGHT
+            ))
+            frame_count, width, height = int(frame_count), int(width), int(height)
             duration = frame_count / fps
             
             # Validate requirements
@@ -50,7 +54,7 @@ class MLBVideoDownloader:
         except Exception as e:
             return False, f"Validation error: {str(e)}"
         finally:
-            if 'cap' in locals():
+            if cap is not None:
                 cap.release()
     
     def setup_for_play(self, pitch_type, condition, play_id):
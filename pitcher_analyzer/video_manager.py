@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import time
 from google.cloud import storage
 from pathlib import Path
@@ -9,7 +11,60 @@ import tempfile
 import requests
 import cv2
 import re
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import vision
+from .video_processor import open_capture
+
+try:
+    import pytesseract
+except ImportError:  # Local OCR is optional; Cloud Vision is used instead
+    pytesseract = None
+
+# Vision API limit on images per batch_annotate_images request
+OCR_BATCH_SIZE = 16
+
+# Crops tried with local OCR before falling back to Cloud Vision; each call
+# starts a tesseract process (5 frames, two corners each)
+LOCAL_OCR_MAX_REGIONS = 10
+
+# Single text line, digits and "MPH" only
+TESSERACT_CONFIG = '--psm 7 -c tessedit_char_whitelist=0123456789MPH'
+
+# Threads for parallel GCS uploads
+UPLOAD_WORKERS = 4
+
+# Write buffer for downloaded videos
+DOWNLOAD_BUFFER_SIZE = 1 << 20
+
+# Bucket handle for the current upload thread, set by _init_upload_worker
+_upload_thread = threading.local()
+
+def _init_upload_worker(bucket_name):
+    """Build one storage client per upload thread"""
+    # The client's HTTP session isn't thread-safe, but each thread can reuse its own
+    _upload_thread.bucket = storage.Client().bucket(bucket_name)
+
+def _upload_blob(blob_name, local_path):
+    """Upload a file to GCS from an upload thread and return its URI"""
+    bucket = _upload_thread.bucket
+    bucket.blob(blob_name).upload_from_filename(local_path)
+    return f"gs://{bucket.name}/{blob_name}"
+
+def _download_blob(blob, local_path):
+    """Download a blob through a large write buffer, like download_to_filename"""
+    f = open(local_path, 'wb', buffering=DOWNLOAD_BUFFER_SIZE)
+    try:
+        with f:
+            blob.download_to_file(f)
+    except Exception:
+        # Don't leave an empty or partial file behind on NotFound or a checksum failure
+        os.remove(local_path)
+        raise
+    
+    # Keep the blob's update time as the file's mtime
+    if blob.updated is not None:
+        mtime = blob.updated.timestamp()
+        os.utime(local_path, (mtime, mtime))
 
 class VideoManager:
     def __init__(self):
@@ -20,6 +75,9 @@ class VideoManager:
         self.temp_dir = Path(tempfile.gettempdir()) / "pitcher_analyzer"
         self.temp_dir.mkdir(exist_ok=True)
         self.vision_client = vision.ImageAnnotatorClient()
+        self._tesseract_available = pytesseract is not None
+        self._upload_pool = None
+        self._local_video_cache = {}
         
     def get_gcs_uri(self, video_path: str) -> str:
         """Get GCS URI for video, uploading if needed"""
@@ -27,10 +85,14 @@ class VideoManager:
             return video_path
             
         try:
-            # Upload to GCS
             blob_name = f"videos/{Path(video_path).name}"
             blob = self.bucket.blob(blob_name)
             
+            # Skip the upload if this video is already in the bucket
+            if blob.exists(client=self.storage_client):
+                return f"gs://{self.bucket_name}/{blob_name}"
+            
+            # Upload to GCS
             self.logger.info(f"Uploading video to GCS: {blob_name}")
             blob.upload_from_filename(video_path)
             
@@ -52,7 +114,7 @@ class VideoManager:
             
             # Download blob
             blob = self.bucket.blob(gcs_path)
-            blob.download_to_filename(str(local_path))
+            _download_blob(blob, local_path)
             
             self.logger.info(f"Downloaded video to: {local_path}")
             return str(local_path)
@@ -75,10 +137,12 @@ class VideoManager:
             # Use ffmpeg to trim
             cmd = [
                 'ffmpeg', '-y',
+                '-fflags', '+genpts',
                 '-i', video_path,
                 '-t', str(duration),
                 '-c:v', 'copy',
                 '-c:a', 'copy',
+                '-avoid_negative_ts', 'make_zero',
                 output_path
             ]
             
@@ -114,15 +178,8 @@ class VideoManager:
 
     def _check_ffmpeg(self):
         """Check if ffmpeg is available"""
-        try:
-            # Try both 'which' (Unix) and 'where' (Windows)
-            if os.name == 'nt':  # Windows
-                result = subprocess.run(['where', 'ffmpeg'], capture_output=True)
-            else:  # Unix
-                result = subprocess.run(['which', 'ffmpeg'], capture_output=True)
-            return result.returncode == 0
-        except:
-            return False
+        # PATH lookup without spawning which/where; also handles PATHEXT on Windows
+        return shutil.which('ffmpeg') is not None
 
     def list_local_videos(self):
         """List all videos in local directories"""
@@ -134,101 +191,200 @@ class VideoManager:
         
         videos = []
         for location in video_locations:
-            if location.exists():
-                videos.extend(list(location.glob("*dodgers*")))
-                videos.extend(list(location.glob("*.mp4")))
-                videos.extend(list(location.glob("*.mov")))
+            videos.extend(self._scan_video_dir(location))
         
         return videos
+
+    def _scan_video_dir(self, location):
+        """List videos in one directory, cached until the directory changes"""
+        try:
+            mtime = os.stat(location).st_mtime
+        except OSError:
+            return []
+        
+        cached = self._local_video_cache.get(location)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        # One pass instead of separate *dodgers*, *.mp4 and *.mov globs
+        videos = []
+        with os.scandir(location) as entries:
+            for entry in entries:
+                name = entry.name
+                if ('dodgers' in name or name.lower().endswith(('.mp4', '.mov'))) and entry.is_file():
+                    videos.append(Path(entry.path))
+        
+        self._local_video_cache[location] = (mtime, videos)
+        return videos
         
     def list_cloud_videos(self):
         """List all videos in GCS bucket"""
         return list(self.bucket.list_blobs(prefix="videos/"))
         
-    def get_gcs_uri(self, video_path: str) -> str:
-        """Get GCS URI for video, uploading if needed"""
-        if video_path.startswith('gs://'):
-            return video_path
+    def get_gcs_uris(self, video_paths):
+        """Get GCS URIs for several videos, uploading them in parallel"""
+        uris = list(video_paths)
+        futures = {}
+        
+        # One listing call instead of an exists() check per video
+        existing = {blob.name for blob in self.list_cloud_videos()}
+        
+        for i, video_path in enumerate(video_paths):
+            if video_path.startswith('gs://'):
+                continue
             
-        try:
-            # Upload to GCS
             blob_name = f"videos/{Path(video_path).name}"
-            blob = self.bucket.blob(blob_name)
+            if blob_name in existing:
+                uris[i] = f"gs://{self.bucket_name}/{blob_name}"
+                continue
             
             self.logger.info(f"Uploading video to GCS: {blob_name}")
-            blob.upload_from_filename(video_path)
-            
-            return f"gs://{self.bucket_name}/{blob_name}"
-            
-        except Exception as e:
-            self.logger.error(f"Upload failed: {str(e)}")
-            return None
+            futures[i] = self._get_upload_pool().submit(_upload_blob, blob_name, video_path)
+        
+        for i, future in futures.items():
+            try:
+                uris[i] = future.result()
+            except Exception as e:
+                self.logger.error(f"Upload failed: {str(e)}")
+                uris[i] = None
+        
+        return uris
+
+    async def get_gcs_uri_async(self, video_path: str) -> str:
+        """Get GCS URI for video without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_gcs_uri, video_path)
+
+    async def upload_many(self, video_paths):
+        """Upload several videos concurrently and return their GCS URIs"""
+        # Same dedup and worker pool as get_gcs_uris, without blocking the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_gcs_uris, list(video_paths))
+
+    def _get_upload_pool(self):
+        """Create the upload thread pool on first use"""
+        # Uploads spend their time waiting on the network, so threads are enough
+        if self._upload_pool is None:
+            self._upload_pool = ThreadPoolExecutor(
+                max_workers=UPLOAD_WORKERS,
+                initializer=_init_upload_worker,
+                initargs=(self.bucket_name,)
+            )
+        return self._upload_pool
+
+    def close(self):
+        """Shut down the upload thread pool, if one was started"""
+        if self._upload_pool is not None:
+            self._upload_pool.shutdown()
+            self._upload_pool = None
 
     def detect_velocity(self, video_path):
         """Detect pitch velocity from broadcast overlay"""
-        cap = cv2.VideoCapture(video_path)
+        cap = open_capture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         # Skip to frames after pitch (where velocity typically appears)
-        # Usually 15-20 frames after release
+        # Usually 15-20 frames after release (grab skips the color conversion)
         for _ in range(20):
-            cap.read()
+            cap.grab()
         
         # Region where velocity typically appears in broadcast
         # Usually top-right or bottom-right corner
         velocity = None
         
         # Check next 30 frames for velocity display
+        regions = []
         for _ in range(30):
             ret, frame = cap.read()
             if not ret:
                 break
             
             # Extract text from velocity regions using OCR
-            # Common broadcast locations:
-            regions = [
-                frame[50:100, -150:-50],    # Top right
-                frame[-100:-50, -150:-50],  # Bottom right
-            ]
-            
-            for region in regions:
-                # Use OCR to find velocity number
-                text = self._ocr_text(region)
-                if text:
-                    # Look for pattern: number followed by MPH
-                    match = re.search(r'(\d{2,3})\s*MPH', text, re.IGNORECASE)
-                    if match:
-                        velocity = int(match.group(1))
-                        break
+            # Common broadcast locations, kept as small grayscale crops so the
+            # full frame can be freed:
+            regions.extend([
+                cv2.cvtColor(frame[50:100, -150:-50], cv2.COLOR_BGR2GRAY),    # Top right
+                cv2.cvtColor(frame[-100:-50, -150:-50], cv2.COLOR_BGR2GRAY),  # Bottom right
+            ])
+        
+        cap.release()
+        
+        # Try local OCR on the first few crops; it needs no network round-trip
+        for region in regions[:LOCAL_OCR_MAX_REGIONS]:
+            if not self._tesseract_available:
+                break
+            velocity = self._parse_velocity(self._local_ocr_text(region))
+            if velocity:
+                return velocity
+        
+        # Fall back to Cloud Vision in batches, stopping at the first batch with a match
+        for start in range(0, len(regions), OCR_BATCH_SIZE):
+            for text in self._ocr_texts(regions[start:start + OCR_BATCH_SIZE]):
+                velocity = self._parse_velocity(text)
+                if velocity:
+                    break
             
             if velocity:
                 break
         
-        cap.release()
         return velocity
 
-    def _ocr_text(self, image):
-        """Extract text from image using Google Cloud Vision"""
-        # Convert image to bytes
-        success, encoded = cv2.imencode('.jpg', image)
-        if not success:
+    def _parse_velocity(self, text):
+        """Parse a velocity reading like '95 MPH' from OCR text"""
+        if not text:
+            return None
+        # Look for pattern: number followed by MPH
+        match = re.search(r'(\d{2,3})\s*MPH', text, re.IGNORECASE)
+        return int(match.group(1)) if match else None
+
+    def _local_ocr_text(self, image):
+        """Extract text from image using a local Tesseract install, if available"""
+        if not self._tesseract_available:
             return None
         
-        content = encoded.tobytes()
-        
-        # Create image object
-        image = vision.Image(content=content)
+        # Binarize and upscale so the overlay digits are easier to read
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        binary = cv2.resize(binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
         
-        # Perform text detection
-        response = self.vision_client.text_detection(image=image)
-        if response.error.message:
+        try:
+            return pytesseract.image_to_string(binary, config=TESSERACT_CONFIG)
+        except (pytesseract.TesseractError, OSError) as e:
+            # A missing or broken install fails the same way for every remaining
+            # crop (TesseractNotFoundError is an OSError), so don't try it again
+            self._tesseract_available = False
+            self.logger.warning(f"Local OCR failed, using Cloud Vision for OCR: {str(e)}")
             return None
+
+    def _ocr_texts(self, images):
+        """Extract text from a batch of images in one Google Cloud Vision request"""
+        texts = [None] * len(images)
+        positions = []
+        ocr_requests = []
+        for i, image in enumerate(images):
+            # Convert image to bytes
+            success, encoded = cv2.imencode('.jpg', image)
+            if not success:
+                continue
+            
+            positions.append(i)
+            ocr_requests.append(vision.AnnotateImageRequest(
+                image=vision.Image(content=encoded.tobytes()),
+                features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
+            ))
+        
+        if not ocr_requests:
+            return texts
         
-        texts = response.text_annotations
-        if texts:
-            return texts[0].description
+        # Perform text detection
+        response = self.vision_client.batch_annotate_images(requests=ocr_requests)
+        for i, result in zip(positions, response.responses):
+            if result.error.message:
+                continue
+            if result.text_annotations:
+                texts[i] = result.text_annotations[0].description
         
-        return None
+        return texts
 
     def get_video(self, video_name):
         """Download video from Google Cloud Storage"""
@@ -242,7 +398,7 @@ class VideoManager:
             local_path = os.path.join(temp_dir, video_name)  # Removed .mp4 extension
             
             self.logger.info(f"Attempting to download {blob.name} from {self.bucket_name}")
-            blob.download_to_filename(local_path)
+            _download_blob(blob, local_path)
             return local_path
             
         except Exception as e:
@@ -1,15 +1,101 @@
 import cv2
-import base64
 import logging
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 from pitcher_analyzer.config import Config
 
+# End-of-image marker followed by start-of-image marker between piped JPEGs
+JPEG_BOUNDARY = b'\xff\xd9\xff\xd8'
+
+# OpenCV FFmpeg backend options that decode H.264 on NVDEC
+CUVID_CAPTURE_OPTIONS = 'hwaccel;cuvid|video_codec;h264_cuvid|vsync;0'
+
+# Whether NVDEC H.264 decode is worth trying: probed from ffmpeg on first
+# use, cleared once OpenCV fails to open a capture with it
+_cuvid_available = None
+
+# Frame size (width, height) used when comparing frames for motion
+MOTION_SIZE = (160, 90)
+
+# Pose network input is POSE_INPUT_SIZE x POSE_INPUT_SIZE
+POSE_INPUT_SIZE = 368
+
+# Heatmap peak needed to count a body part as detected
+MIN_LANDMARK_CONFIDENCE = 0.5
+
+def encode_jpeg(frame):
+    """Encode a frame to JPEG bytes, or None if encoding fails"""
+    success, encoded = cv2.imencode('.jpg', frame)
+    return encoded.tobytes() if success else None
+
+def encode_jpegs(frames):
+    """Encode frames to JPEG bytes in parallel (cv2.imencode releases the GIL)"""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(encode_jpeg, frames))
+
+def _check_cuvid():
+    """Check once whether ffmpeg can decode H.264 on NVDEC"""
+    global _cuvid_available
+    if _cuvid_available is None:
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-decoders'], capture_output=True)
+            _cuvid_available = b'h264_cuvid' in result.stdout
+        except FileNotFoundError:
+            _cuvid_available = False
+    return _cuvid_available
+
+def _is_h264(cap):
+    """Check whether an open capture's video stream is H.264"""
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC)).to_bytes(4, 'little')
+    return fourcc.lower() in (b'h264', b'avc1', b'avc3', b'x264')
+
+def open_capture(video_path):
+    """Open a video capture, using hardware decode when the platform supports it"""
+    global _cuvid_available
+    cuvid_failed = False
+    # OpenCV reads the capture options when the file is opened, so only set
+    # them for this open and respect any options the user already set
+    previous_options = os.environ.get('OPENCV_FFMPEG_CAPTURE_OPTIONS')
+    if previous_options is None and _check_cuvid():
+        os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = CUVID_CAPTURE_OPTIONS
+        try:
+            cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        finally:
+            # Back to unset, as it was before this open
+            os.environ.pop('OPENCV_FFMPEG_CAPTURE_OPTIONS', None)
+        if cap.isOpened():
+            return cap
+        cap.release()
+        cuvid_failed = True
+        
+    # VIDEO_ACCELERATION_ANY falls back to software decode when no
+    # hardware decoder (VAAPI, NVDEC, VideoToolbox, D3D11) is available
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG,
+                           [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if not cap.isOpened():
+        cap.release()
+        cap = cv2.VideoCapture(str(video_path))
+    
+    # The ffmpeg CLI having cuvid says nothing about OpenCV's bundled FFmpeg
+    # (the pip wheels have none). Only an H.264 file that opens without cuvid
+    # shows it is missing; other codecs and unreadable files say nothing
+    if cuvid_failed and cap.isOpened() and _is_h264(cap):
+        _cuvid_available = False
+    return cap
+
 class VideoProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         # For now, let's skip pose detection until we have the model
         # self.net = cv2.dnn.readNetFromTensorflow('pose/graph_opt.pb')
+        # self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        # self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU_FP16)
+        self._blob = np.empty((0, 3, POSE_INPUT_SIZE, POSE_INPUT_SIZE), np.float32)
+        self._resized = np.empty((POSE_INPUT_SIZE, POSE_INPUT_SIZE, 3), np.uint8)
         self.BODY_PARTS = {
             "Nose": 0, "Neck": 1,
             "RShoulder": 2, "RElbow": 3, "RWrist": 4,
@@ -21,7 +107,7 @@ class VideoProcessor:
     def extract_frames(self, video_path: str, pitch_type: str = None) -> list:
         """Extract key frames from pitch video"""
         try:
-            cap = cv2.VideoCapture(str(video_path))
+            cap = open_capture(video_path)
             if not cap.isOpened():
                 raise ValueError("Could not open video file")
 
@@ -37,23 +123,23 @@ class VideoProcessor:
             frame_step = safe_end_frame // (num_frames_needed + 1)  # +1 to leave room at start/end
             
             # Extract frames with safe spacing
-            encoded_frames = []
-            for i in range(num_frames_needed):
-                frame_idx = frame_step * (i + 1)  # Skip first frame_step frames
-                self.logger.info(f"Reading frame {frame_idx} ({i+1}/{num_frames_needed})")
-                
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
+            frame_indices = [frame_step * (i + 1) for i in range(num_frames_needed)]  # Skip first frame_step frames
+            encoded_frames = self._extract_frames_ffmpeg(video_path, frame_indices)
+            if encoded_frames is not None:
+                self.logger.info(f"Extracted {len(encoded_frames)} frames with ffmpeg")
+            else:
+                read_indices = []
+                frames = []
+                for i, (frame_idx, frame) in enumerate(self._read_frames(cap, frame_indices)):
+                    self.logger.info(f"Reading frame {frame_idx} ({i+1}/{num_frames_needed})")
+                    read_indices.append(frame_idx)
+                    frames.append(frame)
                 
-                if ret:
-                    success, encoded = cv2.imencode('.jpg', frame)
-                    if success:
-                        encoded_frames.append(encoded.tobytes())
-                        self.logger.info(f"Encoded frame {frame_idx}")
-                    else:
+                encoded_frames = encode_jpegs(frames)
+                for frame_idx, encoded in zip(read_indices, encoded_frames):
+                    if encoded is None:
                         raise ValueError(f"Failed to encode frame {frame_idx}")
-                else:
-                    raise ValueError(f"Failed to read frame {frame_idx}")
+                self.logger.info(f"Encoded {len(encoded_frames)} frames")
 
             if len(encoded_frames) != num_frames_needed:
                 raise ValueError(f"Only got {len(encoded_frames)} frames, needed {num_frames_needed}")
@@ -67,6 +153,43 @@ class VideoProcessor:
             if 'cap' in locals():
                 cap.release()
 
+    def _extract_frames_ffmpeg(self, video_path, frame_indices):
+        """
+        Extract frames as JPEG bytes in a single ffmpeg decode pass
+        Returns None if ffmpeg is unavailable or doesn't return every frame
+        """
+        if shutil.which('ffmpeg') is None:
+            return None
+            
+        unique_indices = sorted(set(frame_indices))
+        select = '+'.join(f'eq(n\\,{frame_idx})' for frame_idx in unique_indices)
+        cmd = [
+            'ffmpeg', '-v', 'error',
+            '-i', str(video_path),
+            '-vf', f'select={select}',
+            '-vsync', 'vfr',
+            '-q:v', '2',
+            '-f', 'image2pipe',
+            '-vcodec', 'mjpeg',
+            'pipe:1'
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            self.logger.warning(f"ffmpeg frame extraction failed: {result.stderr.decode(errors='ignore').strip()}")
+            return None
+            
+        # Frames arrive back to back; split on each EOI/SOI marker pair
+        jpegs = result.stdout.split(JPEG_BOUNDARY)
+        if len(jpegs) != len(unique_indices):
+            self.logger.warning(f"ffmpeg returned {len(jpegs)} frames, expected {len(unique_indices)}")
+            return None
+        for i in range(len(jpegs) - 1):
+            jpegs[i] += JPEG_BOUNDARY[:2]
+            jpegs[i + 1] = JPEG_BOUNDARY[2:] + jpegs[i + 1]
+            
+        frames_by_index = dict(zip(unique_indices, jpegs))
+        return [frames_by_index[frame_idx] for frame_idx in frame_indices]
+
     def _detect_release_frame(self, cap) -> int:
         """
         Detect the frame where the pitch is released
@@ -77,37 +200,60 @@ class VideoProcessor:
             
             # Sample frames to find motion
             sample_rate = 5  # Check every 5th frame
-            max_motion = 0
-            release_frame = None
+            sample_indices = range(0, total_frames, sample_rate)
             
-            prev_frame = None
-            for frame_idx in range(0, total_frames, sample_rate):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                
-                if not ret:
-                    break
-                    
-                if prev_frame is not None:
-                    # Calculate frame difference
-                    diff = cv2.absdiff(prev_frame, frame)
-                    motion = np.sum(diff)
-                    
-                    # Update if this has more motion
-                    if motion > max_motion:
-                        max_motion = motion
-                        release_frame = frame_idx
-                        
-                prev_frame = frame
-                
-            return release_frame
+            # Downscale every sampled frame into one (N, 90, 160, 3) stack
+            stack = np.empty((len(sample_indices), MOTION_SIZE[1], MOTION_SIZE[0], 3), np.uint8)
+            frame_numbers = []
+            for i, (frame_idx, frame) in enumerate(self._read_frames(cap, sample_indices)):
+                cv2.resize(frame, MOTION_SIZE, dst=stack[i], interpolation=cv2.INTER_AREA)
+                frame_numbers.append(frame_idx)
+            
+            if len(frame_numbers) < 2:
+                return None
+            
+            # Calculate all consecutive frame differences in one pass
+            flat = stack[:len(frame_numbers)].reshape(len(frame_numbers), -1)
+            motion = cv2.absdiff(flat[1:], flat[:-1]).sum(axis=1, dtype=np.int64)
+            
+            # Frame with the most motion, if there was any
+            peak = int(motion.argmax())
+            if motion[peak] == 0:
+                return None
+            return frame_numbers[peak + 1]
             
         except Exception as e:
             self.logger.error(f"Release frame detection failed: {str(e)}")
             return None
 
+    def _read_frames(self, cap, frame_indices):
+        """
+        Yield (index, frame) for the requested frame indices
+        Walks the stream once with grab() and only decodes the frames we keep
+        """
+        frame_indices = np.asarray(frame_indices, dtype=np.int64)
+        frame_indices = frame_indices[frame_indices >= 0]
+        if not len(frame_indices):
+            return
+        
+        # Indices count from the start, so rewind a capture that was already read
+        if cap.get(cv2.CAP_PROP_POS_FRAMES) != 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        # How many times each position was requested, so lookups are a plain index
+        wanted = np.bincount(frame_indices)
+        for frame_idx in range(len(wanted)):
+            if not cap.grab():
+                return
+            if wanted[frame_idx]:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    return
+                for _ in range(wanted[frame_idx]):
+                    yield frame_idx, frame
+
     def _get_frame_indices(self, total_frames, pitch_type):
-        """Determine which frames to extract based on pitch type"""
+        """Determine which frames to extract based on pitch type, as sorted unique indices"""
         if pitch_type == 'CURVEBALL':
             key_points = {
                 'setup': 0.1,
@@ -118,83 +264,105 @@ class VideoProcessor:
                 'follow_through': 0.7,
                 'finish': 0.8
             }
-            return [int(total_frames * percentage) for percentage in key_points.values()]
+            indices = [int(total_frames * percentage) for percentage in key_points.values()]
         else:
             max_frames = 16
-            return [int(i * total_frames / max_frames) for i in range(max_frames)]
+            indices = [int(i * total_frames / max_frames) for i in range(max_frames)]
+        return np.unique(np.array(indices, dtype=np.int32))
 
     def _capture_frames(self, cap, frame_indices):
         """Capture and encode specific frames"""
-        frames = []
-        landmarks = []
-        for i, frame_idx in enumerate(frame_indices):
+        read_frames = []
+        for i, (frame_idx, frame) in enumerate(self._read_frames(cap, frame_indices)):
             self.logger.info(f"Reading frame {frame_idx} ({i+1}/{len(frame_indices)})")
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            
-            if ret:
-                # Get pose landmarks using OpenCV
-                frame_landmarks = self._detect_pose(frame)
-                if frame_landmarks:
-                    landmarks.append(frame_landmarks)
-                    frames.append(frame)
-        return frames, landmarks
+            read_frames.append(frame)
+        
+        # Get pose landmarks using OpenCV, all frames in one forward pass
+        landmarks = self._detect_poses(read_frames)
+        
+        # Keep frames where at least one body part was detected
+        detected = (landmarks[:, :, 2] > MIN_LANDMARK_CONFIDENCE).any(axis=1)
+        frames = [frame for frame, keep in zip(read_frames, detected) if keep]
+        return frames, landmarks[detected]
 
     def process_video(self, video_path, pitch_type='CURVEBALL'):
         """Process video and extract frames with pose landmarks"""
-        frames = []
         landmarks = []
         
-        cap = cv2.VideoCapture(video_path)
+        cap = open_capture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         # Get key frames for analysis
         frame_indices = self._get_frame_indices(total_frames, pitch_type)
         
-        for frame_idx in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            
-            if ret:
-                # For now, return empty landmarks until we have pose detection working
-                frame_landmarks = {}  # temporary
-                landmarks.append(frame_landmarks)
-                # Encode frame for AI model
-                success, buffer = cv2.imencode('.jpg', frame)
-                if success:
-                    frames.append(base64.b64encode(buffer).decode('utf-8'))
+        raw_frames = []
+        for frame_idx, frame in self._read_frames(cap, frame_indices):
+            # For now, return empty landmarks until we have pose detection working
+            frame_landmarks = {}  # temporary
+            landmarks.append(frame_landmarks)
+            raw_frames.append(frame)
         
         cap.release()
+        
+        # Encode frames for AI model as raw JPEG bytes, same as extract_frames
+        frames = [encoded for encoded in encode_jpegs(raw_frames) if encoded is not None]
         return frames, landmarks
 
     def _detect_pose(self, frame):
         """Detect pose landmarks using OpenCV DNN"""
-        frame_height, frame_width = frame.shape[:2]
+        return self._detect_poses([frame])[0]
+
+    def _detect_poses(self, frames):
+        """
+        Detect pose landmarks for a batch of frames in a single forward pass
+        Returns an (N, parts, 3) float32 array of x, y, confidence indexed by part id
+        """
+        if not frames:
+            return np.empty((0, len(self.BODY_PARTS), 3), np.float32)
         
-        # Prepare input blob
-        input_blob = cv2.dnn.blobFromImage(frame, 1.0/255, (368, 368), (0, 0, 0), swapRB=False, crop=False)
+        # Prepare input blob, shape (N, 3, 368, 368), reusing the buffers from earlier calls
+        if len(self._blob) < len(frames):
+            self._blob = np.empty((len(frames), 3, POSE_INPUT_SIZE, POSE_INPUT_SIZE), np.float32)
+        input_blob = self._blob[:len(frames)]
+        for blob, frame in zip(input_blob, frames):
+            cv2.resize(frame, (POSE_INPUT_SIZE, POSE_INPUT_SIZE), dst=self._resized)
+            blob[...] = self._resized.transpose(2, 0, 1)
+            blob *= 1.0/255
         self.net.setInput(input_blob)
         
         # Forward pass
         output = self.net.forward()
         
-        # Extract landmarks
+        return self._landmarks_from_heatmaps(output, [frame.shape[:2] for frame in frames])
+
+    def _landmarks_from_heatmaps(self, heatmaps, frame_shapes):
+        """Extract landmarks from (N, parts, H, W) heatmaps"""
+        num_frames = heatmaps.shape[0]
+        num_parts = len(self.BODY_PARTS)
+        heatmap_height, heatmap_width = heatmaps.shape[2:]
+        frame_heights, frame_widths = np.array(frame_shapes).T[:, :, None]
+        
+        # Find global maxima for every body part at once
+        flat = heatmaps[:, :num_parts].reshape(num_frames, num_parts, -1)
+        peaks = flat.argmax(axis=2)
+        ys, xs = np.divmod(peaks, heatmap_width)
+        
+        # Scale to frame size
+        landmarks = np.empty((num_frames, num_parts, 3), np.float32)
+        landmarks[:, :, 0] = xs * frame_widths // heatmap_width
+        landmarks[:, :, 1] = ys * frame_heights // heatmap_height
+        landmarks[:, :, 2] = np.take_along_axis(flat, peaks[:, :, None], axis=2)[:, :, 0]
+        
+        return landmarks
+
+    def landmarks_by_name(self, frame_landmarks):
+        """Map one frame's landmark array to {part name: (x, y, confidence)} for detected parts"""
         landmarks = {}
         for part_name, part_id in self.BODY_PARTS.items():
-            # Get heatmap for this body part
-            heatmap = output[0, part_id, :, :]
-            
-            # Find global maxima
-            _, conf, _, point = cv2.minMaxLoc(heatmap)
-            
-            # Scale to frame size
-            x = int((point[0] * frame_width) / output.shape[3])
-            y = int((point[1] * frame_height) / output.shape[2])
-            
-            # Add if confidence is high enough
-            if conf > 0.5:
-                landmarks[self._convert_part_name(part_name)] = Point(x, y, conf)
-        
+            name = self._convert_part_name(part_name)
+            x, y, conf = frame_landmarks[part_id]
+            if name and conf > MIN_LANDMARK_CONFIDENCE:
+                landmarks[name] = (float(x), float(y), float(conf))
         return landmarks
 
     def _convert_part_name(self, opencv_name):
@@ -215,9 +383,3 @@ class VideoProcessor:
             "Nose": "nose"
         }
         return name_map.get(opencv_name)
-
-class Point:
-    def __init__(self, x, y, visibility=1.0):
-        self.x = x
-        self.y = y
-        self.visibility = visibility 
\ No newline at end of file
@@ -1,10 +1,253 @@
 import cv2
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 from datetime import datetime
 import numpy as np
 
 __all__ = ['create_analysis_visualization']
 
+# Minimum frames per worker before rendering is split across processes;
+# a spawned worker re-imports the package, so short clips render serially
+MIN_SEGMENT_FRAMES = 1800
+
+# Frames buffered between the decode, blend and encode threads
+PIPELINE_QUEUE_SIZE = 8
+
+# One match per analysis line, consuming the whole line; branches are
+# tried in the same priority order as the original substring checks
+_ANALYSIS_LINE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?=[^\n]*Signs of Fatigue:)(?P<fatigue>)'
+    r'|(?=[^\n]*Arm:)(?P<arm>)'
+    r'|(?=[^\n]*Balance:)(?P<balance>)'
+    r'|[^\n]*?Mechanics Assessment:(?P<assessment>[^\n]*?)(?=Mechanics Assessment:|\n|\Z)'
+    r'|-(?P<bullet>[^\n]*)'
+    r')[^\n]*',
+    re.MULTILINE
+)
+
+# Scorecard lines: an optional category mention, then an optional bullet
+_SCORECARD_LINE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?=[^\n]*signs of fatigue)(?P<fatigue>)'
+    r'|(?=[^\n]*arm)(?P<arm>)'
+    r'|(?=[^\n]*balance)(?P<balance>)'
+    r')?(?:-(?P<bullet>[^\n]*))?[^\n]*',
+    re.MULTILINE | re.IGNORECASE
+)
+_SCORECARD_ASSESSMENT = re.compile(r'Mechanics Assessment:([^\n]*?)(?=Mechanics Assessment:|\n|\Z)')
+
+# Ideal arm slot direction, 1 o'clock position
+_IDEAL_ARM_COS = math.cos(math.pi / 6)
+_IDEAL_ARM_SIN = math.sin(math.pi / 6)
+
+# Head marker color (BGR) indexed by whether balance deviation exceeds 10%
+_BAL_COLORS = ((0, 255, 0), (0, 0, 255))
+
+def _stderr_tail(stderr, limit=500):
+    """Last part of an ffmpeg process's captured stderr, for error messages"""
+    stderr.seek(0)
+    return stderr.read().decode(errors='ignore').strip()[-limit:]
+
+class FFmpegWriter:
+    """Video writer that pipes raw BGR frames to an ffmpeg encoder"""
+    
+    def __init__(self, output_path, fps, frame_size, encoder, threads=0):
+        width, height = frame_size
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', '-',
+            '-c:v', encoder
+        ]
+        if encoder == 'h264_nvenc':
+            cmd += ['-preset', 'p4', '-qp', '23']
+        else:
+            cmd += ['-preset', 'ultrafast', '-threads', str(threads)]
+        cmd += ['-pix_fmt', 'yuv420p', str(output_path)]
+        # stderr goes to a file so a chatty encoder can't fill a pipe and stall
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=self._stderr)
+    
+    def write(self, frame):
+        self.process.stdin.write(memoryview(np.ascontiguousarray(frame)))
+    
+    def release(self):
+        try:
+            self.process.communicate()
+            if self.process.returncode != 0:
+                raise RuntimeError(f"ffmpeg encode failed: {_stderr_tail(self._stderr)}")
+        finally:
+            self._stderr.close()
+
+class FFmpegReader:
+    """Video reader that decodes with ffmpeg, hardware accelerated when available, into BGR frames"""
+    
+    def __init__(self, video_path, frame_size, start_frame=0, max_frames=None):
+        width, height = frame_size
+        self.shape = (height, width, 3)
+        cmd = ['ffmpeg', '-v', 'error', '-hwaccel', 'auto', '-i', str(video_path)]
+        if start_frame:
+            # Skip by decoded frame number; a time seek can land a frame off on
+            # variable frame rate or open-GOP input, duplicating or dropping frames
+            cmd += ['-vf', f'select=gte(n\\,{start_frame})']
+        if max_frames is not None:
+            cmd += ['-frames:v', str(max_frames)]
+        cmd += ['-an', '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-']
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=self._stderr,
+                                        bufsize=width * height * 3)
+        
+        # Read ahead one frame so a failed decode can be detected up front
+        try:
+            _, self._pending = self._read_frame()
+        except RuntimeError:
+            self._pending = None
+    
+    def isOpened(self):
+        return self._pending is not None
+    
+    def read(self):
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return True, frame
+        return self._read_frame()
+    
+    def _read_frame(self):
+        frame = np.empty(self.shape, dtype=np.uint8)
+        view = memoryview(frame).cast('B')
+        filled = 0
+        while filled < len(view):
+            count = self.process.stdout.readinto(view[filled:])
+            if not count:
+                # A decode that dies part way must not look like the end of the video
+                if self.process.wait() != 0:
+                    raise RuntimeError(f"ffmpeg decode failed: {_stderr_tail(self._stderr)}")
+                return False, None
+            filled += count
+        return True, frame
+    
+    def release(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.stdout.close()
+        self.process.wait()
+        self._stderr.close()
+
+def open_video_reader(video_path, frame_size, start_frame=0, max_frames=None):
+    """
+    Open a frame reader, decoding with ffmpeg when available and OpenCV otherwise
+    Reading starts exactly at frame start_frame; frames before it are decoded and dropped
+    """
+    if shutil.which('ffmpeg') is not None:
+        reader = FFmpegReader(video_path, frame_size, start_frame, max_frames)
+        if reader.isOpened():
+            return reader
+        reader.release()
+    
+    cap = cv2.VideoCapture(video_path)
+    # CAP_PROP_POS_FRAMES seeks by timestamp, so step over the frames instead
+    for _ in range(start_frame):
+        if not cap.grab():
+            break
+    return cap
+
+@lru_cache(maxsize=None)
+def _ffmpeg_h264_encoder():
+    """Find a working ffmpeg H.264 encoder, preferring NVENC, or None"""
+    if shutil.which('ffmpeg') is None:
+        return None
+    
+    # Being listed isn't enough for NVENC (it needs a GPU), so try a tiny encode
+    for encoder in ('h264_nvenc', 'libx264'):
+        cmd = [
+            'ffmpeg', '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256',
+            '-frames:v', '1',
+            '-c:v', encoder,
+            '-f', 'null', '-'
+        ]
+        if subprocess.run(cmd, capture_output=True).returncode == 0:
+            return encoder
+    return None
+
+def open_video_writer(output_path, fps, frame_size, threads=0):
+    """
+    Open an H.264 video writer
+    Pipes frames to ffmpeg when it has a working encoder, otherwise uses
+    OpenCV's writer, falling back to MPEG-4 if H.264 is unavailable
+    threads caps the ffmpeg software encoder's threads (0 uses every core)
+    """
+    # yuv420p needs even dimensions
+    encoder = _ffmpeg_h264_encoder()
+    if encoder and fps > 0 and frame_size[0] % 2 == 0 and frame_size[1] % 2 == 0:
+        return FFmpegWriter(output_path, fps, frame_size, encoder, threads)
+    
+    for codec in ('avc1', 'mp4v'):
+        out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*codec), fps, frame_size)
+        if out.isOpened():
+            return out
+        out.release()
+    raise ValueError(f"Could not open video writer for {output_path}")
+
+def render_overlay(draw, width, height):
+    """
+    Render a static overlay once so it can be blended onto many frames
+    Returns the overlay colors and opacity cropped to the drawn area, and the crop's (x, y) offset
+    """
+    # Draw over black and over white; the difference gives each pixel's
+    # coverage, including the antialiased edges of text
+    on_black = np.zeros((height, width, 3), dtype=np.uint8)
+    on_white = np.full((height, width, 3), 255, dtype=np.uint8)
+    draw(on_black)
+    draw(on_white)
+    alpha = 1 - (on_white.astype(np.float32) - on_black).mean(axis=2) / 255
+    
+    # Crop to the pixels that were drawn
+    drawn = alpha > 0
+    rows = np.flatnonzero(drawn.any(axis=1))
+    cols = np.flatnonzero(drawn.any(axis=0))
+    y0, y1 = rows[0], rows[-1] + 1
+    x0, x1 = cols[0], cols[-1] + 1
+    alpha = alpha[y0:y1, x0:x1]
+    
+    # Undo the blend with black to recover the drawn colors
+    colors = on_black[y0:y1, x0:x1] / np.maximum(alpha, 1e-6)[:, :, None]
+    colors = np.clip(np.rint(colors), 0, 255).astype(np.uint8)
+    return colors, alpha, (int(x0), int(y0))
+
+def prepare_overlay(colors, alpha):
+    """
+    Split a rendered overlay into opaque pixels, which are copied as-is,
+    and partially covered edge pixels, which are the only ones blended
+    """
+    opaque = alpha >= 1
+    edge = np.nonzero((alpha > 0) & ~opaque)
+    edge_alpha = alpha[edge][:, None]
+    edge_colors = colors[edge] * edge_alpha + 0.5
+    return colors, opaque[:, :, None], edge, edge_colors, 1 - edge_alpha
+
+def apply_overlay(roi, overlay):
+    """Composite a prepared overlay onto roi in place"""
+    colors, opaque, edge, edge_colors, edge_keep = overlay
+    np.copyto(roi, colors, where=opaque)
+    if len(edge_colors):
+        roi[edge] = (edge_colors + roi[edge] * edge_keep).astype(np.uint8)
+
 def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher_name='KERSHAW', output_path=None):
     """Create visualization with mechanical analysis overlay"""
     if output_path is None:
@@ -16,9 +259,264 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
     fps = cap.get(cv2.CAP_PROP_FPS)
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if not cap.isOpened() or width <= 0 or height <= 0:
+        cap.release()
+        raise ValueError(f"Could not open video file {video_path}")
+    
+    # The scorecard is the same on every frame, so it is drawn once
+    overlay, offset = _prepared_scorecard(width, height, pitch_type, analysis_text)
+    
+    # Long videos are rendered in segments, one per core
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    workers = min(os.cpu_count() or 1, total_frames // MIN_SEGMENT_FRAMES)
+    if workers > 1:
+        try:
+            _overlay_parallel(video_path, output_path, fps, (width, height),
+                              total_frames, workers, overlay, offset)
+            return output_path
+        except Exception:
+            logging.getLogger(__name__).warning(
+                "Parallel rendering failed, rendering serially", exc_info=True)
+    
+    cap = open_video_reader(video_path, (width, height))
+    out = open_video_writer(output_path, fps, (width, height))
+    try:
+        _overlay_frames(cap, out, overlay, offset)
+    finally:
+        cap.release()
+        out.release()
+    return output_path
+
+@lru_cache(maxsize=32)
+def _prepared_scorecard(width, height, pitch_type, analysis_text):
+    """
+    Lay out, draw and prepare the scorecard, cached for repeated clips
+    The returned arrays are shared between calls, so they are read-only
+    """
+    analysis = _parse_analysis_text(analysis_text)
+    layout = _scorecard_layout(width, height, pitch_type, analysis)
+    scorecard, alpha, offset = render_overlay(
+        lambda overlay: _draw_scorecard(overlay, layout), width, height)
+    overlay = prepare_overlay(scorecard, alpha)
+    
+    colors, opaque, edge, edge_colors, edge_keep = overlay
+    for array in (colors, opaque, *edge, edge_colors, edge_keep):
+        array.setflags(write=False)
+    return overlay, offset
+
+def _overlay_frames(cap, out, overlay, offset, max_frames=None):
+    """
+    Composite the prepared scorecard onto frames from cap and write them to out
+    Decoding and encoding run on their own threads, fed through bounded queues
+    """
+    x0, y0 = offset
+    y1, x1 = y0 + overlay[0].shape[0], x0 + overlay[0].shape[1]
+    
+    decoded = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    blended = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    errors = []
+    
+    def decode():
+        try:
+            count = 0
+            while (max_frames is None or count < max_frames) and not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                decoded.put(frame)
+                count += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            decoded.put(None)
+    
+    def encode():
+        while True:
+            frame = blended.get()
+            if frame is None:
+                return
+            if errors:
+                continue  # Keep draining so the blend loop never blocks
+            try:
+                out.write(frame)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+    
+    decoder = threading.Thread(target=decode, daemon=True)
+    encoder = threading.Thread(target=encode, daemon=True)
+    decoder.start()
+    encoder.start()
+    
+    written = 0
+    finished = False
+    try:
+        while True:
+            frame = decoded.get()
+            if frame is None:
+                finished = True
+                break
+            
+            # Only the scorecard region is touched
+            apply_overlay(frame[y0:y1, x0:x1], overlay)
+            blended.put(frame)
+            written += 1
+    finally:
+        stop.set()
+        # Unblock the decoder if we stopped early
+        while not finished:
+            finished = decoded.get() is None
+        blended.put(None)
+        decoder.join()
+        encoder.join()
+    
+    if errors:
+        raise errors[0]
+    return written
+
+def _overlay_segment(video_path, segment_path, start, max_frames, fps, frame_size, overlay, offset, threads):
+    """Render one segment of the output video in a worker process"""
+    cap = open_video_reader(video_path, frame_size, start, max_frames)
+    out = open_video_writer(segment_path, fps, frame_size, threads)
+    try:
+        return _overlay_frames(cap, out, overlay, offset, max_frames)
+    finally:
+        cap.release()
+        out.release()
+
+def _overlay_parallel(video_path, output_path, fps, frame_size, total_frames, workers, overlay, offset):
+    """Render the video in segments across processes and join them into output_path"""
+    segment_frames = -(-total_frames // workers)
+    # Share the cores between the segments' encoders instead of each using all of them
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        segment_paths = [str(Path(tmp_dir) / f"segment_{i:03d}.mp4") for i in range(workers)]
+        # Spawn rather than fork: the caller may hold gRPC clients and threads,
+        # which are not fork-safe
+        mp_context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(
+                    _overlay_segment, video_path, segment_path, i * segment_frames,
+                    # The last segment reads to the end in case the frame count is short
+                    segment_frames if i < workers - 1 else None,
+                    fps, frame_size, overlay, offset, threads)
+                for i, segment_path in enumerate(segment_paths)
+            ]
+            segment_counts = [future.result() for future in futures]
+        
+        # A short segment means its decode stopped early; only the last may run short
+        for i, count in enumerate(segment_counts[:-1]):
+            if count != segment_frames:
+                raise RuntimeError(f"Segment {i} rendered {count} of {segment_frames} frames")
+        
+        _concat_segments(segment_paths, segment_counts, output_path, fps, frame_size, tmp_dir)
+
+def _concat_segments(segment_paths, segment_counts, output_path, fps, frame_size, tmp_dir):
+    """Join rendered segments, with ffmpeg if available so they aren't re-encoded"""
+    if shutil.which('ffmpeg') is not None:
+        list_path = Path(tmp_dir) / "segments.txt"
+        list_path.write_text(''.join(f"file '{path}'\n" for path in segment_paths))
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error',
+            '-f', 'concat', '-safe', '0',
+            '-i', str(list_path),
+            '-c', 'copy',
+            str(output_path)
+        ]
+        if subprocess.run(cmd, capture_output=True).returncode == 0:
+            return
+    
+    # Stitch the segments back together frame by frame
+    out = open_video_writer(output_path, fps, frame_size)
+    try:
+        for segment_path, expected in zip(segment_paths, segment_counts):
+            cap = cv2.VideoCapture(segment_path)
+            count = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                out.write(frame)
+                count += 1
+            cap.release()
+            if count != expected:
+                raise RuntimeError(f"Read {count} of {expected} frames back from {segment_path}")
+    finally:
+        out.release()
+
+def _parse_analysis_text(text):
+    """Parse analysis text into explanations and assessment"""
+    try:
+        result = {
+            'fatigue': '',
+            'arm': '',
+            'balance': '',
+            'assessment': 'N/A'
+        }
+        
+        current_category = None
+        for match in _ANALYSIS_LINE.finditer(text):
+            kind = match.lastgroup
+            if kind == 'assessment':
+                result['assessment'] = match.group('assessment').strip()
+            elif kind == 'bullet':
+                if current_category:
+                    result[current_category] = match.group('bullet').strip()
+            else:
+                current_category = kind
+        
+        return result
+        
+    except Exception as e:
+        print(f"Error parsing analysis text: {str(e)}")
+        return {
+            'fatigue': '',
+            'arm': '',
+            'balance': '',
+            'assessment': 'N/A'
+        }
+
+@lru_cache(maxsize=4096)
+def _text_width(text, font_face, font_scale):
+    """Width of text in pixels, without the 1px thickness padding getTextSize adds"""
+    return cv2.getTextSize(text, font_face, font_scale, 1)[0][0] - 1
+
+def _wrap_text(text, max_width, font_face, font_scale):
+    """Wrap text to fit within specified width"""
+    words = text.split()
+    space_width = _text_width(' ', font_face, font_scale)
     
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    # Cumulative width of the words, each followed by a space
+    ends = [0]
+    ends.extend(accumulate(_text_width(word, font_face, font_scale) + space_width for word in words))
+    
+    lines = []
+    start = 0
+    while start < len(words):
+        # Last word that still fits on a line starting at start
+        end = bisect_right(ends, ends[start] + space_width + max_width - 1) - 1
+        if end <= start:
+            # A first word that doesn't fit leaves an empty line before it
+            if start == 0:
+                lines.append('')
+            end = start + 1
+        lines.append(' '.join(words[start:end]))
+        start = end
+        
+    return lines
+
+def _scorecard_layout(width, height, pitch_type, analysis):
+    """
+    Lay out the scorecard for a frame size
+    Returns the rectangles as (pt1, pt2, color) and the text as
+    (text, pos, font, scale, color, thickness) so drawing needs no text measuring
+    """
+    rects = []
+    texts = []
     
     # Adjust overlay dimensions
     overlay_width = int(width * 0.25)  # Reduce from 0.35 to 0.25
@@ -38,174 +536,103 @@ def create_analysis_visualization(video_path, analysis_text, pitch_type, pitcher
     BLUE = (135, 48, 0)
     WHITE = (255, 255, 255)
     
-    def parse_analysis_text(text):
-        """Parse analysis text into explanations and assessment"""
-        try:
-            result = {
-                'fatigue': '',
-                'arm': '',
-                'balance': '',
-                'assessment': 'N/A'
-            }
-            
-            current_category = None
-            lines = text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if 'Signs of Fatigue:' in line:
-                    current_category = 'fatigue'
-                elif 'Arm:' in line:
-                    current_category = 'arm'
-                elif 'Balance:' in line:
-                    current_category = 'balance'
-                elif 'Mechanics Assessment:' in line:
-                    result['assessment'] = line.split('Mechanics Assessment:')[1].strip()
-                elif line.startswith('-'):
-                    if current_category:
-                        result[current_category] = line[1:].strip()
-            
-            return result
-            
-        except Exception as e:
-            print(f"Error parsing analysis text: {str(e)}")
-            return {
-                'fatigue': '',
-                'arm': '',
-                'balance': '',
-                'assessment': 'N/A'
-            }
-
-    def wrap_text(text, max_width, font_face, font_scale):
-        """Wrap text to fit within specified width"""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            # Get size of current line with test word
-            line_text = ' '.join(current_line)
-            (line_width, _) = cv2.getTextSize(line_text, font_face, font_scale, 1)[0]
-            
-            if line_width > max_width:
-                # Remove last word and add line to lines
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]  # Start new line with word that didn't fit
-                
-        # Add remaining words
-        if current_line:
-            lines.append(' '.join(current_line))
-            
-        return lines
+    # Background
+    rects.append(((overlay_x, overlay_y),
+                  (overlay_x + overlay_width, overlay_y + overlay_height),
+                  NAVY))
+    
+    # Header
+    rects.append(((overlay_x, overlay_y),
+                  (overlay_x + overlay_width, overlay_y + header_height),
+                  BLUE))
+
+    # Header text
+    header_text = "PITCHER SCORECARD"
+    text_size = cv2.getTextSize(header_text, cv2.FONT_HERSHEY_COMPLEX_SMALL, TITLE_SIZE, 2)[0]
+    header_x = int(overlay_x + (overlay_width - text_size[0]) // 2)
+    header_y = int(overlay_y + (header_height / 2) + text_size[1]/2)
+    texts.append((header_text, (header_x, header_y),
+                  cv2.FONT_HERSHEY_COMPLEX_SMALL, TITLE_SIZE, WHITE, 1))
+
+    # Content spacing
+    line_spacing = (overlay_height - header_height - 30) / 6  # Keep tighter spacing
+    content_x = int(overlay_x + 15)
+    y = overlay_y + header_height + int(line_spacing * 0.8)
+
+    # Pitch type
+    status_text = pitch_type.upper()
+    desc_width = cv2.getTextSize(status_text, cv2.FONT_HERSHEY_SIMPLEX, STATUS_SIZE, 2)[0][0]
+    desc_x = int(overlay_x + (overlay_width - desc_width) // 2)
+    texts.append((status_text, (desc_x, int(y)),
+                  cv2.FONT_HERSHEY_SIMPLEX, STATUS_SIZE, WHITE, 1))
 
-    analysis = parse_analysis_text(analysis_text)
+    # Add deviation with more spacing before and after
+    y += line_spacing * 0.8  # Increased from 0.6
+    deviation_text = f"Deviation from ideal: {analysis['assessment']}"
+    dev_width = cv2.getTextSize(deviation_text, cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE * 0.8, 1)[0][0]
+    dev_x = int(overlay_x + (overlay_width - dev_width) // 2)
+    texts.append((deviation_text, (dev_x, int(y)),
+                  cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE * 0.8, WHITE, 1))
+
+    # Add more space before categories
+    y += line_spacing * 0.8  # Increased from 0.6
+
+    # Categories with scores and explanations
+    categories = [
+        ("SIGNS OF FATIGUE", analysis['fatigue']),
+        ("ARM", analysis['arm']),
+        ("BALANCE", analysis['balance'])
+    ]
     
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-            
-        overlay = frame.copy()
+    for cat, explanation in categories:
+        # Category name only (no score)
+        texts.append((cat, (content_x, int(y)),
+                      cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE, WHITE, 1))
         
-        # Background
-        cv2.rectangle(overlay, 
-                     (overlay_x, overlay_y), 
-                     (overlay_x + overlay_width, overlay_y + overlay_height),
-                     NAVY, -1)
-        
-        # Header
-        cv2.rectangle(overlay,
-                     (overlay_x, overlay_y),
-                     (overlay_x + overlay_width, overlay_y + header_height),
-                     BLUE, -1)
-
-        # Header text
-        header_text = "PITCHER SCORECARD"
-        text_size = cv2.getTextSize(header_text, cv2.FONT_HERSHEY_COMPLEX_SMALL, TITLE_SIZE, 2)[0]
-        header_x = int(overlay_x + (overlay_width - text_size[0]) // 2)
-        header_y = int(overlay_y + (header_height / 2) + text_size[1]/2)
-        cv2.putText(overlay, header_text,
-                   (header_x, header_y),
-                   cv2.FONT_HERSHEY_COMPLEX_SMALL, TITLE_SIZE, WHITE, 1)
-
-        # Content spacing
-        line_spacing = (overlay_height - header_height - 30) / 6  # Keep tighter spacing
-        content_x = int(overlay_x + 15)
-        y = overlay_y + header_height + int(line_spacing * 0.8)
-
-        # Pitch type
-        status_text = pitch_type.upper()
-        desc_width = cv2.getTextSize(status_text, cv2.FONT_HERSHEY_SIMPLEX, STATUS_SIZE, 2)[0][0]
-        desc_x = int(overlay_x + (overlay_width - desc_width) // 2)
-        cv2.putText(overlay, status_text,
-                   (desc_x, int(y)),
-                   cv2.FONT_HERSHEY_SIMPLEX, STATUS_SIZE, WHITE, 1)
-
-        # Add deviation with more spacing before and after
-        y += line_spacing * 0.8  # Increased from 0.6
-        deviation_text = f"Deviation from ideal: {analysis['assessment']}"
-        dev_width = cv2.getTextSize(deviation_text, cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE * 0.8, 1)[0][0]
-        dev_x = int(overlay_x + (overlay_width - dev_width) // 2)
-        cv2.putText(overlay, deviation_text,
-                  (dev_x, int(y)),
-                  cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE * 0.8, WHITE, 1)
-
-        # Add more space before categories
-        y += line_spacing * 0.8  # Increased from 0.6
-
-        # Categories with scores and explanations
-        categories = [
-            ("SIGNS OF FATIGUE", analysis['fatigue']),
-            ("ARM", analysis['arm']),
-            ("BALANCE", analysis['balance'])
-        ]
-        
-        for cat, explanation in categories:
-            # Category name only (no score)
-            cv2.putText(overlay, cat,
-                      (content_x, int(y)),
-                      cv2.FONT_HERSHEY_SIMPLEX, DATA_SIZE, WHITE, 1)
+        # Add explanation with tighter spacing and right margin
+        if explanation:
+            available_width = overlay_width - content_x - 60
+            wrapped_lines = _wrap_text(explanation, 
+                                      available_width,
+                                      cv2.FONT_HERSHEY_SIMPLEX, 
+                                      EXPLANATION_SIZE)
             
-            # Add explanation with tighter spacing and right margin
-            if explanation:
-                available_width = overlay_width - content_x - 60
-                wrapped_lines = wrap_text(explanation, 
-                                       available_width,
-                                       cv2.FONT_HERSHEY_SIMPLEX, 
-                                       EXPLANATION_SIZE)
-                
-                explanation_y = y + int(line_spacing * 0.35)
-                
-                # Add bullet only for first line
-                first_line = True
-                for line in wrapped_lines:
-                    prefix = "- " if first_line else "  "
-                    cv2.putText(overlay, f"{prefix}{line}",
-                              (content_x + 20, int(explanation_y)),
-                              cv2.FONT_HERSHEY_SIMPLEX, EXPLANATION_SIZE, WHITE, 1)
-                    explanation_y += int(line_spacing * 0.5)
-                    first_line = False
-                
-                y = explanation_y + int(line_spacing * 0.25)
-            else:
-                y += line_spacing * 0.8
+            explanation_y = y + int(line_spacing * 0.35)
+            
+            # Add bullet only for first line
+            first_line = True
+            for line in wrapped_lines:
+                prefix = "- " if first_line else "  "
+                texts.append((f"{prefix}{line}", (content_x + 20, int(explanation_y)),
+                              cv2.FONT_HERSHEY_SIMPLEX, EXPLANATION_SIZE, WHITE, 1))
+                explanation_y += int(line_spacing * 0.5)
+                first_line = False
+            
+            y = explanation_y + int(line_spacing * 0.25)
+        else:
+            y += line_spacing * 0.8
 
-        # Blend overlay
-        frame = cv2.addWeighted(overlay, 0.95, frame, 0.05, 0)
-        out.write(frame)
-    
-    cap.release()
-    out.release()
-    return output_path
+    return rects, texts
+
+def _draw_scorecard(overlay, layout):
+    """Draw a laid out scorecard onto an image"""
+    rects, texts = layout
+    for pt1, pt2, color in rects:
+        cv2.rectangle(overlay, pt1, pt2, color, -1)
+    for text, pos, font, scale, color, thickness in texts:
+        cv2.putText(overlay, text, pos, font, scale, color, thickness)
 
-def create_mechanics_overlay(self, frame, landmarks, deviations):
-    """Create visual overlay showing mechanical deviations"""
-    overlay = frame.copy()
+def create_mechanics_overlay(self, frame, landmarks, deviations, out=None):
+    """
+    Create visual overlay showing mechanical deviations
+    Pass out to draw into a reused frame-sized buffer, or out=frame to draw in place
+    """
+    if out is None:
+        overlay = frame.copy()
+    else:
+        overlay = out
+        if overlay is not frame:
+            np.copyto(overlay, frame)
     
     # Draw skeleton connections
     self._draw_pose_skeleton(overlay, landmarks)
@@ -233,12 +660,7 @@ def _visualize_arm_slot(self, overlay, landmarks, deviation):
              (0, 255, 0), 2)
     
     # Draw ideal arm slot line
-    ideal_angle = np.pi/6  # 1 o'clock position
-    ideal_length = np.sqrt((elbow.x - shoulder.x)**2 + (elbow.y - shoulder.y)**2)
-    ideal_end = (
-        int(shoulder.x + ideal_length * np.cos(ideal_angle)),
-        int(shoulder.y + ideal_length * np.sin(ideal_angle))
-    )
+    ideal_end = _ideal_arm_end(shoulder.x, shoulder.y, elbow.x, elbow.y)
     cv2.line(overlay,
              (int(shoulder.x), int(shoulder.y)),
              ideal_end,
@@ -253,6 +675,13 @@ def _visualize_arm_slot(self, overlay, landmarks, deviation):
                 (255, 255, 255),
                 2)
 
+def _ideal_arm_end(sx, sy, ex, ey):
+    """End point of an arm of the actual length held at the ideal slot angle"""
+    dx = ex - sx
+    dy = ey - sy
+    length = math.sqrt(dx * dx + dy * dy)
+    return int(sx + length * _IDEAL_ARM_COS), int(sy + length * _IDEAL_ARM_SIN)
+
 def _visualize_balance(self, overlay, landmarks, deviation):
     """Visualize balance metrics"""
     head = landmarks['nose']
@@ -268,7 +697,7 @@ def _visualize_balance(self, overlay, landmarks, deviation):
     cv2.circle(overlay,
               (int(head.x), int(head.y)),
               5,
-              (0, 0, 255) if deviation > 0.1 else (0, 255, 0),
+              _BAL_COLORS[int(deviation > 0.1)],
               -1)
     
     # Add balance metric
@@ -283,9 +712,9 @@ def _visualize_balance(self, overlay, landmarks, deviation):
 def create_scorecard(analysis_text):
     """Create scorecard visualization from analysis text"""
     # Parse the mechanics assessment
-    variance_line = [line for line in analysis_text.split('\n') if 'Mechanics Assessment:' in line]
-    if variance_line:
-        assessment = variance_line[0].split('Mechanics Assessment:')[1].strip()
+    variance_match = _SCORECARD_ASSESSMENT.search(analysis_text)
+    if variance_match:
+        assessment = variance_match.group(1).strip()
     else:
         assessment = "N/A"
         
@@ -312,19 +741,17 @@ def create_scorecard(analysis_text):
         "BALANCE": None
     }
     
+    category_names = {'fatigue': "SIGNS OF FATIGUE", 'arm': "ARM", 'balance': "BALANCE"}
     current_category = None
-    for line in analysis_text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        for category in categories.keys():
-            if category.lower() in line.lower():
+    for match in _SCORECARD_LINE.finditer(analysis_text):
+        for key, category in category_names.items():
+            if match.group(key) is not None:
                 current_category = category
                 break
                 
-        if current_category and line.startswith('-'):
-            categories[current_category] = line[1:].strip()
+        bullet = match.group('bullet')
+        if current_category and bullet is not None:
+            categories[current_category] = bullet.strip()
     
     # Add categories and their explanations
     y_pos = 400
@@ -9,4 +9,8 @@ setup(
         'google-cloud-aiplatform',
         'pandas',
     ],
+    extras_require={
+        # Local OCR for velocity detection (needs the tesseract binary)
+        'ocr': ['pytesseract>=0.3.10'],
+    },
 ) 
\ No newline at end of file
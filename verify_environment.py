@@ -1,9 +1,48 @@
 import os
-from google.cloud import storage
 import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Distribution names (lowercase, hyphenated) that check_dependencies requires
+_REQUIRED_PACKAGES = frozenset({
+    'google-cloud-storage',
+    'google-cloud-videointelligence',
+    'opencv-python',
+    'numpy',
+    'vertexai'
+})
+
+def _batch_exists(paths):
+    """
+    Check which paths exist, reading each parent directory once
+    Paths that share a parent cost one scandir instead of a stat each
+    """
+    split_paths = [os.path.split(os.path.normpath(path)) for path in paths]
+    listings = {}
+    for parent, _ in split_paths:
+        if parent not in listings:
+            try:
+                with os.scandir(parent or '.') as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+    return [name in listings[parent] for parent, name in split_paths]
+
+def _bucket_loaded(bucket):
+    """
+    Whether a bucket reloaded inside a batch got its metadata back
+    Failed requests leave a future in place of the properties dict
+    """
+    properties = bucket._properties
+    return isinstance(properties, dict) and 'id' in properties
+
 class EnvironmentVerifier:
+    # Shared across instances so repeated checks reuse one client and skip known buckets
+    _client = None
+    _bucket_exists_cache = {}
+    _installed_packages = None
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.required_dirs = [
@@ -15,12 +54,19 @@ class EnvironmentVerifier:
     def verify_all(self):
         """Run all verification checks"""
         try:
-            checks = [
-                self.check_credentials(),
-                self.check_gcs_setup(),
-                self.check_directories(),
-                self.check_dependencies()
-            ]
+            # Fail fast on missing credentials before paying for the GCS round trip
+            if not self.check_credentials():
+                return False
+            
+            # The remaining checks are independent and mostly wait on I/O, so run them together
+            check_fns = (
+                self.check_gcs_setup,
+                self.check_directories,
+                self.check_dependencies
+            )
+            with ThreadPoolExecutor(max_workers=len(check_fns)) as executor:
+                futures = [executor.submit(fn) for fn in check_fns]
+                checks = [future.result() for future in futures]
             
             if all(checks):
                 self.logger.info("All environment checks passed!")
@@ -28,7 +74,7 @@ class EnvironmentVerifier:
             return False
             
         except Exception as e:
-            self.logger.error(f"Environment verification failed: {str(e)}")
+            self.logger.error("Environment verification failed: %s", e)
             return False
             
     def check_credentials(self):
@@ -39,79 +85,99 @@ class EnvironmentVerifier:
             return False
             
         if not os.path.exists(creds_path):
-            self.logger.error(f"Credentials file not found: {creds_path}")
+            self.logger.error("Credentials file not found: %s", creds_path)
             return False
             
-        self.logger.info(f"Found credentials at: {creds_path}")
+        self.logger.info("Found credentials at: %s", creds_path)
         return True
         
-    def check_gcs_setup(self):
+    def check_gcs_setup(self, bucket_names=("baseball-pitcher-analyzer-videos",)):
         """Verify Google Cloud Storage setup"""
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket("baseball-pitcher-analyzer-videos")
+            # Imported here so the other checks don't pay for the GCS client libraries
+            from google.api_core.exceptions import NotFound
+            from google.cloud import storage
+            if EnvironmentVerifier._client is None:
+                EnvironmentVerifier._client = storage.Client()
+            
+            unchecked = [name for name in bucket_names if name not in self._bucket_exists_cache]
+            if unchecked:
+                # Look all buckets up in one batched request; the batch raises
+                # NotFound after loading the buckets that do exist, and leaves
+                # the missing ones unloaded
+                buckets = [self._client.bucket(name) for name in unchecked]
+                try:
+                    with self._client.batch():
+                        for bucket in buckets:
+                            bucket.reload()
+                except NotFound:
+                    pass
+                for bucket in buckets:
+                    self._bucket_exists_cache[bucket.name] = _bucket_loaded(bucket)
             
-            if not bucket.exists():
-                self.logger.warning("Main storage bucket does not exist")
+            missing = [name for name in bucket_names if not self._bucket_exists_cache[name]]
+            if missing:
+                self.logger.warning("Storage buckets do not exist: %s", missing)
                 return False
                 
             self.logger.info("GCS setup verified")
             return True
             
         except Exception as e:
-            self.logger.error(f"GCS setup check failed: {str(e)}")
+            self.logger.error("GCS setup check failed: %s", e)
             return False
             
     def check_directories(self):
         """Verify required directories exist"""
-        for dir_path in self.required_dirs:
-            path = Path(dir_path)
-            if not path.exists():
-                self.logger.info(f"Creating directory: {path}")
+        for dir_path, exists in zip(self.required_dirs, _batch_exists(self.required_dirs)):
+            if not exists:
+                path = Path(dir_path)
+                self.logger.info("Creating directory: %s", path)
                 path.mkdir(parents=True, exist_ok=True)
                 
         return True
         
     def check_dependencies(self):
         """Verify required Python packages"""
-        required_packages = [
-            'google-cloud-storage',
-            'google-cloud-videointelligence',
-            'opencv-python',
-            'numpy',
-            'vertexai'
-        ]
-        
-        import pkg_resources
-        installed = [pkg.key for pkg in pkg_resources.working_set]
+        # Installed distributions are scanned once per process
+        if EnvironmentVerifier._installed_packages is None:
+            from importlib.metadata import distributions
+            EnvironmentVerifier._installed_packages = frozenset(
+                dist.metadata['Name'].lower().replace('_', '-')
+                for dist in distributions()
+                if dist.metadata['Name']
+            )
         
-        missing = [pkg for pkg in required_packages if pkg not in installed]
+        missing = _REQUIRED_PACKAGES - self._installed_packages
         
         if missing:
-            self.logger.error(f"Missing packages: {missing}")
+            self.logger.error("Missing packages: %s", sorted(missing))
             return False
             
         return True
 
     def check_ffmpeg(self):
         """Verify ffmpeg installation"""
+        if shutil.which('ffmpeg') is None:
+            return False
+        
+        # Only run the binary when explicitly asked to confirm it actually works
+        if os.getenv('VERIFY_FFMPEG_EXEC') != '1':
+            return True
+        
+        import subprocess
         try:
-            import subprocess
             result = subprocess.run(['ffmpeg', '-version'], 
-                                 capture_output=True, 
-                                 text=True)
+                                 stdout=subprocess.DEVNULL, 
+                                 stderr=subprocess.DEVNULL)
             return result.returncode == 0
-        except:
+        except FileNotFoundError:
+            # Removed between the PATH lookup and the exec
             return False
 
 def verify_environment():
-    checks = {
-        'ffmpeg': check_ffmpeg(),
-        'google_cloud': check_google_cloud(),
-        'opencv': check_opencv(),
-        'numpy': check_numpy(),
-        'credentials': check_credentials()
-    }
+    """Run all environment checks"""
+    return EnvironmentVerifier().verify_all()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)